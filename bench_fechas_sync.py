@@ -0,0 +1,136 @@
+# bench_fechas_sync.py
+# ---------------------------------------------------------
+# Benchmark de fechas_sync vs las funciones originales de los scripts de sync
+# sobre una columna del tamaño de Bucket.
+#
+# Simula una corrida de sync_bucket_updates_only.py:
+#   1) _parse_date_series(Funnel inserted_at_ultima)
+#   2) to_bogota_str(Bucket "Fecha Actualizacion")            (corrección histórico)
+#   3) to_bogota_str(old) / to_bogota_str(new)                (comparación)
+#   4) to_bogota_str(final) + _parse_date_series(final)       (formato + regla mensual)
+# y verifica que el resultado sea idéntico.
+#
+# Uso: python bench_fechas_sync.py [filas_bucket] [filas_funnel]
+# ---------------------------------------------------------
+
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+import fechas_sync
+
+TZ = "America/Bogota"
+
+
+# ===== Versiones originales (referencia) =====
+def _is_blank_series(s):
+    s2 = s.astype(str).str.strip()
+    return s.isna() | s2.eq("") | s2.str.lower().isin(["nan", "none", "nat"])
+
+def parse_date_series_original(x):
+    dt = pd.to_datetime(x, errors="coerce")
+    if dt.isna().mean() > 0.90:
+        dt = pd.to_datetime(x.astype(str).str.replace("T", " ", regex=False), errors="coerce")
+    return dt
+
+def to_bogota_str_original(x, tz_local=TZ, assume_naive_is_utc=True):
+    s = x.astype(str).str.strip()
+    s = s.str.replace("T", " ", regex=False)
+
+    blank = _is_blank_series(s)
+    out = pd.Series([""] * len(s), index=s.index, dtype="object")
+    if blank.all():
+        return out
+
+    is_utc_hint = s.str.contains(r"(?:Z$|\+00:00|\+0000|UTC)", case=False, regex=True)
+
+    if is_utc_hint.any():
+        dt_utc = pd.to_datetime(s[is_utc_hint], errors="coerce", utc=True)
+        dt_local = dt_utc.dt.tz_convert(tz_local)
+        out.loc[is_utc_hint] = dt_local.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_local.notna(), "")
+
+    if (~is_utc_hint).any():
+        dt_naive = pd.to_datetime(s[~is_utc_hint], errors="coerce")
+        if assume_naive_is_utc:
+            dt_utc2 = dt_naive.dt.tz_localize("UTC", nonexistent="NaT", ambiguous="NaT")
+            dt_local2 = dt_utc2.dt.tz_convert(tz_local)
+            out.loc[~is_utc_hint] = dt_local2.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_local2.notna(), "")
+        else:
+            out.loc[~is_utc_hint] = dt_naive.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_naive.notna(), "")
+
+    out = out.where(~blank, "")
+    return out
+
+
+# ===== Datos sintéticos =====
+def generar_columnas(n_bucket: int, n_funnel: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp("2025-01-01")
+
+    # Funnel: inserted_at_ultima en ISO con Z (como llega de la BD), repetida en las filas de cada deuda
+    n_deudas = max(n_funnel // 4, 1)
+    seg = rng.integers(0, 120 * 86400, n_deudas)
+    ultima = (inicio + pd.to_timedelta(seg, unit="s")).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    funnel = pd.Series(np.asarray(ultima, dtype=object)[rng.integers(0, n_deudas, n_funnel)], dtype=object)
+
+    # Bucket: fechas ya en Colombia (muchas repetidas: varias filas por deuda) y ~30% vacías
+    base = (inicio + pd.to_timedelta(rng.choice(seg, n_bucket), unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+    bucket = pd.Series(np.where(rng.random(n_bucket) < 0.3, "", base), dtype=object)
+
+    # Lo nuevo que llega del merge (última del Funnel por deuda)
+    nuevo = pd.Series(np.where(rng.random(n_bucket) < 0.5, "nan", rng.choice(funnel.to_numpy(), n_bucket)), dtype=object)
+    return funnel, bucket, nuevo
+
+
+def corrida(funnel, bucket, nuevo, parse_date_series, to_bogota_str):
+    inserted = parse_date_series(funnel)
+    hist = to_bogota_str(bucket, tz_local=TZ, assume_naive_is_utc=False)
+    old_cmp = to_bogota_str(hist, tz_local=TZ, assume_naive_is_utc=False)
+    new_cmp = to_bogota_str(nuevo, tz_local=TZ, assume_naive_is_utc=True)
+    mask_diff = ~_is_blank_series(new_cmp) & old_cmp.ne(new_cmp)
+    final = hist.where(~mask_diff, new_cmp)
+    final = to_bogota_str(final, tz_local=TZ, assume_naive_is_utc=False)
+    mensual = parse_date_series(final)
+    return inserted, final, mensual
+
+
+def medir(fn, *args, repeticiones: int = 3):
+    tiempos = []
+    res = None
+    for _ in range(repeticiones):
+        fechas_sync.limpiar_cache_fechas()
+        t0 = time.perf_counter()
+        res = fn(*args)
+        tiempos.append(time.perf_counter() - t0)
+    return min(tiempos), res
+
+
+def main():
+    n_bucket = int(sys.argv[1]) if len(sys.argv) > 1 else 30_000
+    n_funnel = int(sys.argv[2]) if len(sys.argv) > 2 else 150_000
+    funnel, bucket, nuevo = generar_columnas(n_bucket, n_funnel)
+
+    t_orig, r_orig = medir(corrida, funnel, bucket, nuevo, parse_date_series_original, to_bogota_str_original)
+    t_new, r_new = medir(corrida, funnel, bucket, nuevo, fechas_sync.parse_date_series, fechas_sync.to_bogota_str)
+
+    for a, b in zip(r_orig, r_new):
+        assert a.equals(b), "❌ fechas_sync no coincide con la versión original"
+
+    # Solo to_bogota_str sobre la columna de Bucket (3 pasadas de la misma columna)
+    def tres_pasadas(to_bogota_str):
+        h = to_bogota_str(bucket, tz_local=TZ, assume_naive_is_utc=False)
+        to_bogota_str(h, tz_local=TZ, assume_naive_is_utc=False)
+        return to_bogota_str(h, tz_local=TZ, assume_naive_is_utc=False)
+
+    t3_orig, _ = medir(tres_pasadas, to_bogota_str_original)
+    t3_new, _ = medir(tres_pasadas, fechas_sync.to_bogota_str)
+
+    print(f"Bucket: {n_bucket:,} filas | Funnel: {n_funnel:,} filas")
+    print(f"Corrida completa   -> original: {t_orig:.3f}s | fechas_sync: {t_new:.3f}s | x{t_orig / t_new:.1f}")
+    print(f"3x to_bogota_str   -> original: {t3_orig:.3f}s | fechas_sync: {t3_new:.3f}s | x{t3_orig / t3_new:.1f}")
+    print("✅ Resultados idénticos")
+
+
+if __name__ == "__main__":
+    main()
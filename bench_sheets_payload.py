@@ -0,0 +1,147 @@
+# bench_sheets_payload.py
+# ---------------------------------------------------------
+# Benchmark de sheets_payload vs los caminos actuales de serialización
+# (tiempo y pico de memoria con tracemalloc) sobre un DataFrame tipado.
+#
+# Caminos comparados:
+#   1) df_to_rows de los scripts de sync      -> reindex + astype(str) + values.tolist()
+#   2) _prepare_df_for_sheets + values.tolist() (subida completa / append)
+#   3) _df_to_str_matrix                       (comparación del upsert)
+#   4) Sanitizado celda por celda de applyChanges (pd.isna + .item())
+# y verifica que los valores coincidan donde la semántica es la misma.
+#
+# Uso: python bench_sheets_payload.py [filas] [columnas]
+# ---------------------------------------------------------
+
+import sys
+import json
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from sheets_payload import df_a_filas, df_a_texto
+
+
+# ===== Versiones actuales (referencia) =====
+def df_to_rows_original(df, header):
+    return df.reindex(columns=header, fill_value="").astype(str).values.tolist()
+
+def _prepare_df_for_sheets(df):
+    df_out = df.copy()
+    df_out = df_out.replace([np.inf, -np.inf], np.nan)
+    for c in df_out.columns:
+        if pd.api.types.is_datetime64_any_dtype(df_out[c]):
+            df_out[c] = pd.to_datetime(df_out[c], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+    df_out = df_out.where(pd.notna(df_out), "")
+    return df_out
+
+def prepare_values_original(df):
+    return _prepare_df_for_sheets(df).values.tolist()
+
+def _df_to_str_matrix(df, cols):
+    out = df[cols].copy()
+    for c in cols:
+        out[c] = out[c].astype(str)
+        out.loc[out[c].isin(["nan", "NaT", "<NA>", "None"]), c] = ""
+    return out
+
+def str_matrix_original(df):
+    return _df_to_str_matrix(_prepare_df_for_sheets(df), df.columns.tolist())
+
+def sanitizado_original(df):
+    rows = []
+    for row_values in df.values.tolist():
+        rows.append(["" if pd.isna(x) or x in [np.inf, -np.inf] else (x.item() if hasattr(x, "item") else x) for x in row_values])
+    return rows
+
+
+# ===== Datos sintéticos =====
+def generar_df(n: int, m: int, seed: int = 0) -> pd.DataFrame:
+    # ~1/3 float (con NaN, inf y enteros como float), 1/6 int, 1/6 fechas (NaT, algunas con zona), 1/3 texto (con None)
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp("2025-01-01")
+    cols = {}
+    for j in range(m):
+        tipo = j % 6
+        if tipo in (0, 1):
+            v = rng.normal(1e5, 5e4, n).round(2)
+            v[rng.random(n) < 0.3] = np.round(v[rng.random(n) < 0.3][:1].sum())
+            v = np.where(rng.random(n) < 0.3, np.round(v), v)
+            v[rng.random(n) < 0.1] = np.nan
+            v[rng.random(n) < 0.001] = np.inf
+            cols[f"num_{j}"] = v
+        elif tipo == 2:
+            cols[f"int_{j}"] = rng.integers(0, 10_000_000, n)
+        elif tipo == 3:
+            f = pd.Series(inicio + pd.to_timedelta(rng.integers(0, 120 * 86400, n), unit="s"))
+            f[rng.random(n) < 0.2] = pd.NaT
+            cols[f"fecha_{j}"] = f.dt.tz_localize("America/Bogota") if j % 12 == 3 else f
+        else:
+            base = np.array([f"valor {k}" for k in range(500)], dtype=object)
+            t = base[rng.integers(0, len(base), n)]
+            t[rng.random(n) < 0.15] = None
+            cols[f"txt_{j}"] = t
+    return pd.DataFrame(cols)
+
+
+def medir(fn, *args, repeticiones: int = 2):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        tiempos.append(time.perf_counter() - t0)
+        del res
+    tracemalloc.start()
+    res = fn(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tiempos), pico / 2 ** 20, res
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    df = generar_df(n, m)
+    header = df.columns.tolist()
+    # Los scripts de sync trabajan con strings (get_all_values)
+    df_txt = df.astype(str)
+
+    casos = [
+        ("df_to_rows (sync, strings)", df_to_rows_original, (df_txt, header), lambda d, h: df_a_filas(d, h, texto=True), (df_txt, header)),
+        ("_prepare_df_for_sheets + tolist", prepare_values_original, (df,), df_a_filas, (df,)),
+        ("_df_to_str_matrix (upsert)", str_matrix_original, (df,), df_a_texto, (df,)),
+        ("sanitizado celda a celda", sanitizado_original, (df,), df_a_filas, (df,)),
+    ]
+
+    print(f"DataFrame: {n:,} filas x {m} columnas")
+    print(f"{'camino':34s} | {'actual':>16s} | {'sheets_payload':>16s} | {'x tiempo':>8s}")
+    resultados = {}
+    for nombre, fn_orig, args_orig, fn_new, args_new in casos:
+        t_o, mem_o, r_o = medir(fn_orig, *args_orig)
+        t_n, mem_n, r_n = medir(fn_new, *args_new)
+        resultados[nombre] = (r_o, r_n)
+        print(f"{nombre:34s} | {t_o:7.2f}s {mem_o:6.0f}MB | {t_n:7.2f}s {mem_n:6.0f}MB | x{t_o / t_n:7.1f}")
+
+    # ===== Verificaciones =====
+    r_o, r_n = resultados["df_to_rows (sync, strings)"]
+    assert r_o == r_n, "❌ df_to_rows no coincide sobre strings"
+
+    # Valores nativos: iguales con == (3 == 3.0) y JSON estricto sin NaN/inf
+    r_o, r_n = resultados["_prepare_df_for_sheets + tolist"]
+    assert r_o == r_n, "❌ payload nativo no coincide con _prepare_df_for_sheets"
+    json.dumps(r_n[:1000], allow_nan=False)
+
+    # Texto: idéntico salvo floats enteros ("3" en vez de "3.0")
+    r_o, r_n = resultados["_df_to_str_matrix (upsert)"]
+    for c in header:
+        a, b = r_o[c], r_n[c]
+        if c.startswith("num_"):
+            b = b.where(~b.str.fullmatch(r"-?\d+"), b + ".0")
+        assert a.equals(b), f"❌ texto no coincide en {c}"
+
+    print("✅ Resultados equivalentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# fechas_sync.py
+# ---------------------------------------------------------
+# Capa de fechas compartida por sync_bucket.py y sync_bucket_updates_only.py
+# - Detecta el formato UNA vez por columna (mismo criterio que pandas:
+#   el primer valor no vacío de la columna)
+# - Parsea SOLO los valores únicos
+# - Cachea string -> Timestamp y string -> string Bogotá mientras dure la corrida
+#   (la misma columna de Bucket pasa varias veces por to_bogota_str)
+#
+# Resultado idéntico a:
+#   _parse_date_series -> pd.to_datetime(x, errors="coerce") (+ reintento sin "T")
+#   to_bogota_str      -> versión original de sync_bucket_updates_only.py
+# ---------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+TZ = "America/Bogota"
+FMT_SALIDA = "%Y-%m-%d %H:%M:%S"
+
+UTC_HINT_REGEX = r"(?:Z$|\+00:00|\+0000|UTC)"
+
+# Strings que pandas salta al inferir el formato (además de "")
+_NAT_STRINGS = {"NaT", "nat", "NAT", "nan", "NaN", "NAN"}
+
+# llave -> pd.Series (index = string de entrada, valores = resultado)
+_CACHE = {}
+
+
+def limpiar_cache_fechas():
+    _CACHE.clear()
+
+
+def detectar_formato(unicos) -> str:
+    """
+    Formato de la columna a partir del primer valor no vacío (igual que pandas al inferir).
+    Devuelve "mixed" si no se puede adivinar (pandas parsea valor por valor).
+    """
+    for v in unicos:
+        if isinstance(v, str) and v and v not in _NAT_STRINGS:
+            return guess_datetime_format(v) or "mixed"
+    return "mixed"
+
+
+def _resolver(llave, unicos: pd.Index, calcular, sin_repetidos: bool = False) -> pd.Index:
+    # Busca los únicos en la cache de la llave y calcula solo los que faltan
+    # (sin_repetidos=True cuando los valores ya vienen de pd.factorize)
+    if len(unicos) == 0:
+        return pd.Index(calcular(unicos))
+    cache = _CACHE.get(llave)
+    if cache is None:
+        distintos = unicos if sin_repetidos else unicos.unique()
+        calculados = calcular(distintos)
+        _CACHE[llave] = pd.Series(calculados, index=distintos)
+        if len(distintos) == len(unicos):
+            return pd.Index(calculados)
+        return pd.Index(_CACHE[llave].reindex(unicos).array)
+
+    faltan = unicos[cache.index.get_indexer(unicos) < 0]
+    if len(faltan):
+        faltan = faltan.unique()
+        cache = pd.concat([cache, pd.Series(calcular(faltan), index=faltan)])
+        _CACHE[llave] = cache
+    return pd.Index(cache.reindex(unicos).array)
+
+
+def _parse_unicos(unicos: pd.Index, fmt: str, utc: bool = False) -> pd.Index:
+    return _resolver(
+        ("ts", fmt, utc),
+        unicos,
+        lambda v: pd.to_datetime(v, format=fmt, errors="coerce", utc=utc),
+        sin_repetidos=True,
+    )
+
+
+def _es_texto(x: pd.Series) -> bool:
+    return pd.api.types.is_string_dtype(x.dtype) and pd.api.types.infer_dtype(x, skipna=True) in ("string", "empty")
+
+
+def _expandir(valores_unicos: pd.Index, codigos, x: pd.Series) -> pd.Series:
+    # Vuelve de los únicos a la columna completa (código -1 = nulo -> NaT)
+    valores = valores_unicos.take(codigos, allow_fill=True, fill_value=pd.NaT)
+    return pd.Series(valores, index=x.index, name=x.name)
+
+
+def parse_fechas(x: pd.Series, utc: bool = False) -> pd.Series:
+    """Equivalente cacheado de pd.to_datetime(x, errors="coerce", utc=utc)."""
+    if not _es_texto(x):
+        return pd.to_datetime(x, errors="coerce", utc=utc)
+    codigos, unicos = pd.factorize(x)
+    unicos = pd.Index(unicos, dtype=object)
+    return _expandir(_parse_unicos(unicos, detectar_formato(unicos), utc), codigos, x)
+
+
+def parse_date_series(x: pd.Series) -> pd.Series:
+    dt = parse_fechas(x)
+    if dt.isna().mean() > 0.90:
+        dt = parse_fechas(x.astype(str).str.replace("T", " ", regex=False))
+    return dt
+
+
+def _normalizar(v: pd.Index) -> np.ndarray:
+    # strip + "T" -> " " (igual que la versión original)
+    return np.asarray(v.str.strip().str.replace("T", " ", regex=False), dtype=object)
+
+
+def _clasificar(v: pd.Index) -> np.ndarray:
+    # 0 = vacío | 1 = con pista UTC | 2 = sin zona
+    blank = np.asarray((v == "") | v.str.lower().isin(["nan", "none", "nat"]), dtype=bool)
+    hint = np.asarray(v.str.contains(UTC_HINT_REGEX, case=False, regex=True), dtype=bool)
+    return np.where(blank, 0, np.where(hint, 1, 2))
+
+
+def _a_bogota_unicos(crudos: pd.Index, tz_local: str, assume_naive_is_utc: bool) -> np.ndarray:
+    out = np.full(len(crudos), "", dtype=object)
+
+    # Normalización y clasificación solo dependen del string: se cachean por valor crudo
+    unicos = pd.Index(_resolver(("norm",), crudos, _normalizar, sin_repetidos=True).to_numpy(), dtype=object)
+    tipo = _resolver(("tipo",), unicos, _clasificar).to_numpy()
+    if (tipo == 0).all():
+        return out
+
+    for hint in (True, False):
+        m = (tipo == 1) if hint else (tipo != 1)
+        if not m.any():
+            continue
+        sub = unicos[m]
+        # El formato se detecta sobre la columna (incluye vacíos, como pandas)
+        fmt = detectar_formato(sub)
+
+        def calcular(v, fmt=fmt, hint=hint):
+            if hint:
+                dt = pd.to_datetime(v, format=fmt, errors="coerce", utc=True).tz_convert(tz_local)
+            else:
+                dt = pd.to_datetime(v, format=fmt, errors="coerce")
+                if assume_naive_is_utc:
+                    dt = dt.tz_localize("UTC", nonexistent="NaT", ambiguous="NaT").tz_convert(tz_local)
+            return np.where(dt.notna(), dt.strftime(FMT_SALIDA).astype(object), "")
+
+        out[m] = _resolver(("bogota", tz_local, assume_naive_is_utc, fmt, hint), sub, calcular).to_numpy()
+
+    out[tipo == 0] = ""
+    return out
+
+
+def _sembrar_salida(valores: np.ndarray, tz_local: str):
+    # Un string ya formateado (FMT_SALIDA, sin zona) vuelve a sí mismo con assume_naive_is_utc=False:
+    # así la comparación y el formato final de la misma columna no se recalculan
+    ya = pd.Index(valores[valores != ""], dtype=object).unique()
+    if len(ya):
+        _resolver(("bogota", tz_local, False, FMT_SALIDA, False), ya, lambda v: v.to_numpy())
+
+
+def to_bogota_str(x: pd.Series, tz_local: str = TZ, assume_naive_is_utc: bool = True) -> pd.Series:
+    # Se trabaja sobre los únicos (la columna de Bucket repite mucho) y se expande al final
+    codigos, crudos = pd.factorize(x.astype(str))
+    crudos = pd.Index(crudos, dtype=object)
+
+    valores = _a_bogota_unicos(crudos, tz_local, assume_naive_is_utc)
+    _sembrar_salida(valores, tz_local)
+
+    # código -1 (nulo) -> vacío
+    out = np.where(codigos >= 0, valores.take(np.clip(codigos, 0, None)) if len(valores) else "", "")
+    return pd.Series(out, index=x.index, dtype="object")
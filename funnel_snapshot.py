@@ -0,0 +1,119 @@
+# funnel_snapshot.py
+# ---------------------------------------------------------
+# Snapshot local del Funnel publicado por el timeline (Bucket_Renovado.ipynb, última celda)
+# y consumido por sync_bucket.py y sync_bucket_updates_only.py.
+#
+# - Después de escribir la hoja Funnel, el timeline la lee con get_all_values (la misma
+#   lectura que hacen los scripts) y deja en snapshots/funnel/:
+#     meta.json  -> versión de la hoja (modifiedTime de Drive, igual antes y después de leer),
+#                   columnas, filas
+#     datos.npz  -> la tabla de strings en el orden de la hoja (códigos + categorías por columna)
+#                   + "orden": filas ordenadas por inserted_at_ultima (estable, vacíos al final)
+#                   + "ultimas": última fila por Id deuda en ese orden
+# - El transporte es el cache de GitHub Actions (no se versiona en git): el workflow del
+#   timeline lo guarda con una llave única por corrida y los workflows de Bucket restauran
+#   el más reciente (prefijo funnel-snapshot-).
+# - Solo se usa si la versión coincide con la hoja: cualquier escritura posterior en el
+#   Spreadsheet (otro job, una persona) cambia el modifiedTime y se vuelve a leer Sheets.
+#   Un cache viejo restaurado cae en el mismo caso.
+# ---------------------------------------------------------
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from fechas_sync import parse_date_series
+
+DIR_SNAPSHOT_FUNNEL = os.path.join("snapshots", "funnel")
+
+# Debe coincidir con VERSION_SNAPSHOT_FUNNEL del notebook
+VERSION_SNAPSHOT_FUNNEL = 2
+
+
+def calcular_orden_ultimas(df: pd.DataFrame, col_fecha: str, col_id: str):
+    """
+    "orden" y "ultimas" del snapshot (posiciones de df, que debe tener RangeIndex):
+      orden   -> filas por col_fecha (sort estable, vacíos/NaT al final)
+      ultimas -> última fila por col_id (sin espacios) en ese orden
+    Las fechas se parsean sobre la columna completa; sync_bucket.py hace lo mismo antes de filtrar.
+    """
+    fechas = parse_date_series(df[col_fecha])
+    orden = fechas.sort_values(kind="stable", na_position="last").index.to_numpy()
+    ids = df[col_id].astype(str).str.strip().to_numpy()[orden]
+    ultimas = orden[~pd.Series(ids).duplicated(keep="last").to_numpy()]
+    return orden, ultimas
+
+
+def ordenar_vigentes(df_vigentes: pd.DataFrame, col_dt: str, vigentes: np.ndarray, orden: np.ndarray = None) -> pd.DataFrame:
+    """
+    Filas vigentes (df completo filtrado con la máscara posicional "vigentes") ordenadas por
+    col_dt (estable). Con "orden" del snapshot se reutiliza ese orden sin volver a ordenar;
+    da lo mismo siempre que col_dt se haya parseado sobre la columna completa, antes de filtrar.
+    """
+    if orden is None:
+        return df_vigentes.sort_values(col_dt, kind="stable")
+    # Posición de cada fila del snapshot dentro de las filas vigentes
+    posicion = np.cumsum(vigentes) - 1
+    return df_vigentes.iloc[posicion[orden[vigentes[orden]]]]
+
+
+def leer_meta_snapshot(carpeta: str = DIR_SNAPSHOT_FUNNEL):
+    ruta = os.path.join(carpeta, "meta.json")
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _motivo_no_vigente(meta, sheet_id, tab_name, col_fecha, col_id):
+    if meta is None:
+        return "no hay snapshot local"
+    if meta.get("formato") != VERSION_SNAPSHOT_FUNNEL:
+        return f"formato {meta.get('formato')} != {VERSION_SNAPSHOT_FUNNEL}"
+    if meta.get("spreadsheet_id") != sheet_id or meta.get("hoja") != tab_name:
+        return "el snapshot es de otra hoja"
+    if meta.get("col_fecha") != col_fecha or (col_id is not None and meta.get("col_id") != col_id):
+        return "columnas de fecha/id distintas"
+    return None
+
+
+def _cargar_tabla(carpeta: str, meta: dict):
+    with np.load(os.path.join(carpeta, "datos.npz"), allow_pickle=False) as z:
+        # Por posición: la hoja puede traer encabezados repetidos (p. ej. columnas vacías)
+        datos = {i: z[f"k{i}"].astype(object)[z[f"c{i}"]] for i in range(len(meta["columnas"]))}
+        orden = z["orden"].astype(np.int64)
+        ultimas = z["ultimas"].astype(np.int64)
+    df = pd.DataFrame(datos, index=pd.RangeIndex(meta["filas"]), columns=range(len(meta["columnas"])))
+    df.columns = meta["columnas"]
+    return df, orden, ultimas
+
+
+def cargar_snapshot_funnel(gc, sheet_id: str, tab_name: str, col_fecha: str, col_id: str = None,
+                           carpeta: str = DIR_SNAPSHOT_FUNNEL):
+    """
+    Devuelve {"df", "orden", "ultimas", "version"} si el snapshot local corresponde a la
+    versión actual de la hoja; None si hay que leer Sheets.
+      df      -> igual que read_worksheet_as_df (strings, header sin espacios, orden de la hoja)
+      orden   -> posiciones de df ordenadas por col_fecha (estable, vacíos/NaT al final)
+      ultimas -> posiciones de la última fila por col_id en ese orden (= sort + groupby.tail(1))
+    """
+    meta = leer_meta_snapshot(carpeta)
+    motivo = _motivo_no_vigente(meta, sheet_id, tab_name, col_fecha, col_id)
+
+    if motivo is None:
+        try:
+            version = gc.open_by_key(sheet_id).get_lastUpdateTime()
+        except Exception as e:
+            version = None
+            motivo = f"no se pudo leer la versión de la hoja ({str(e)[:120]})"
+        if motivo is None and version != meta.get("version_hoja"):
+            motivo = f"la hoja cambió ({meta.get('version_hoja')} -> {version})"
+
+    if motivo is not None:
+        print(f"ℹ️ Snapshot Funnel no usado: {motivo}. Se lee Sheets.")
+        return None
+
+    df, orden, ultimas = _cargar_tabla(carpeta, meta)
+    print(f"🗂️ Funnel desde snapshot local ({meta['filas']:,} filas, versión {meta['version_hoja']})")
+    return {"df": df, "orden": orden, "ultimas": ultimas, "version": meta["version_hoja"]}
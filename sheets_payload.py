@@ -0,0 +1,185 @@
+# sheets_payload.py
+# ---------------------------------------------------------
+# Serializador único DataFrame -> payload de Sheets (list of lists)
+# - Columna por columna según el dtype (sin astype(str) + isin por columna
+#   ni sanitizado celda por celda)
+# - NaN / NaT / None / pd.NA / inf -> ""
+# - float entero -> int (3.0 se escribe "3", igual que lo devuelve Sheets)
+# - Fechas (naive o con zona) -> "%Y-%m-%d %H:%M:%S" en hora local de la columna
+# - texto=False: valores nativos de Python listos para JSON (str/int/float/bool)
+#   texto=True : todo como string (para comparar contra get_all_values)
+# - escapar=True: a un texto que empieza con "'" se le antepone otro "'"
+#   (USER_ENTERED se come el primero), igual que string_escaping="default" de
+#   set_with_dataframe. Fórmulas ("=...") y textos con forma de número los sigue
+#   interpretando Sheets, como ya pasaba con set_with_dataframe (allow_formulas=True).
+#
+# Los notebooks (Bucket_Renovado.ipynb, EJECUCIÓN_DIARIA_TIMELINE_CARTERA.ipynb)
+# importan este módulo; sólo en Colab sin el repo usan la copia literal que
+# llevan embebida (test_sheets_payload.py verifica que sea idéntica).
+# ---------------------------------------------------------
+
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+FMT_FECHA = "%Y-%m-%d %H:%M:%S"
+
+# Hasta aquí un float entero se puede pasar a int sin perder precisión
+_MAX_ENTERO_EXACTO = 2 ** 53
+
+
+def _vacios(n: int) -> np.ndarray:
+    return np.full(n, "", dtype=object)
+
+
+def _flotantes(v: np.ndarray, texto: bool) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float64)
+    out = _vacios(len(v))
+    with np.errstate(invalid="ignore"):
+        finitos = np.isfinite(v)
+        enteros = finitos & (np.abs(v) < _MAX_ENTERO_EXACTO) & (v == np.trunc(v))
+    decimales = finitos & ~enteros
+    if texto:
+        out[enteros] = v[enteros].astype(np.int64).astype(str)
+        out[decimales] = v[decimales].astype(str)
+    else:
+        out[enteros] = v[enteros].astype(np.int64)
+        out[decimales] = v[decimales].astype(object)
+    return out
+
+
+def _fechas(s: pd.Series, fmt: str) -> np.ndarray:
+    # Con zona: se escribe la hora local de la columna (igual que .dt.strftime)
+    if getattr(s.dt, "tz", None) is not None:
+        s = s.dt.tz_localize(None)
+    nulos = s.isna().to_numpy()
+    if fmt == FMT_FECHA and not nulos.all():
+        # Camino rápido: ISO de numpy ("YYYY-MM-DDTHH:MM:SS") y la "T" (posición 10) -> " "
+        txt = np.datetime_as_string(s.to_numpy(dtype="datetime64[ns]"), unit="s").astype("<U19")
+        txt.view(np.uint32).reshape(-1, 19)[:, 10] = ord(" ")
+    else:
+        txt = s.dt.strftime(fmt).to_numpy(dtype=object)
+    out = np.asarray(txt, dtype=object)
+    out[nulos] = ""
+    return out
+
+
+def _valor(x, texto: bool, fmt: str):
+    # Camino lento (solo columnas object con tipos mezclados)
+    if isinstance(x, str):
+        return x
+    if x is None or x is pd.NaT or x is pd.NA:
+        return ""
+    if isinstance(x, (bool, np.bool_)):
+        return ("TRUE" if x else "FALSE") if texto else bool(x)
+    if isinstance(x, (int, np.integer)):
+        return str(int(x)) if texto else int(x)
+    if isinstance(x, (float, np.floating)):
+        return _flotantes(np.array([x]), texto)[0]
+    if isinstance(x, (datetime, date, np.datetime64)):
+        ts = pd.Timestamp(x)
+        return "" if pd.isna(ts) else ts.strftime(fmt)
+    return str(x)
+
+
+def _objetos(v: np.ndarray, texto: bool, fmt: str) -> np.ndarray:
+    nulos = np.asarray(pd.isna(v), dtype=bool)
+    out = v.copy()
+    out[nulos] = ""
+    resto = ~nulos
+    if not resto.any():
+        return out
+
+    tipo = pd.api.types.infer_dtype(v[resto], skipna=False)
+    if tipo == "string":
+        return out
+
+    # Caso típico: columna numérica que pasó por fillna("") (floats/ints + "")
+    es_texto = np.fromiter((isinstance(x, str) for x in v[resto]), dtype=bool, count=int(resto.sum()))
+    no_texto = np.flatnonzero(resto)[~es_texto]
+    sub = v[no_texto]
+    tipo_sub = pd.api.types.infer_dtype(sub, skipna=False)
+    if tipo_sub in ("integer", "floating", "mixed-integer-float"):
+        out[no_texto] = _flotantes(sub.astype(np.float64), texto)
+    else:
+        out[no_texto] = [_valor(x, texto, fmt) for x in sub]
+    return out
+
+
+def escapar_apostrofes(v: np.ndarray) -> np.ndarray:
+    """
+    Antepone "'" a los textos que empiezan con "'" (payload para USER_ENTERED).
+    """
+    marcar = np.fromiter((isinstance(x, str) and x[:1] == "'" for x in v), dtype=bool, count=len(v))
+    if not marcar.any():
+        return v
+    out = v.copy()
+    out[marcar] = ["'" + x for x in v[marcar]]
+    return out
+
+
+def serializar_columna(s: pd.Series, texto: bool = False, fmt_fecha: str = FMT_FECHA, escapar: bool = False) -> np.ndarray:
+    """
+    Una columna -> ndarray object con valores listos para Sheets.
+    """
+    dtype = s.dtype
+    n = len(s)
+    if n == 0:
+        return _vacios(0)
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        # Se serializan solo las categorías y se expanden con los códigos
+        cats = serializar_columna(pd.Series(dtype.categories), texto, fmt_fecha, escapar)
+        codigos = s.cat.codes.to_numpy()
+        out = _vacios(n)
+        ok = codigos >= 0
+        out[ok] = cats[codigos[ok]]
+        return out
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return _fechas(s, fmt_fecha)
+
+    if pd.api.types.is_bool_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        v = s.to_numpy()
+        return np.where(v, "TRUE", "FALSE").astype(object) if texto else v.astype(object)
+
+    if pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_extension_array_dtype(dtype):
+        v = s.to_numpy()
+        return v.astype(str).astype(object) if texto else v.astype(object)
+
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        # float64/float32 y nullables (Int64/Float64: pd.NA -> NaN)
+        return _flotantes(s.to_numpy(dtype=np.float64, na_value=np.nan), texto)
+
+    # Sólo las columnas object pueden traer texto
+    out = _objetos(s.to_numpy(dtype=object), texto, fmt_fecha)
+    return escapar_apostrofes(out) if escapar else out
+
+
+def df_a_filas(df: pd.DataFrame, columnas: list = None, texto: bool = False, fmt_fecha: str = FMT_FECHA,
+               escapar: bool = False) -> list:
+    """
+    DataFrame -> list of lists para ws.update / ws.append_rows (sin header).
+    Si se pasan columnas, se reordena y las que falten quedan en "".
+    """
+    if columnas is not None:
+        df = df.reindex(columns=columnas, fill_value="")
+    if df.shape[1] == 0:
+        return [[] for _ in range(len(df))]
+    cols = [serializar_columna(df.iloc[:, j], texto, fmt_fecha, escapar) for j in range(df.shape[1])]
+    return list(map(list, zip(*cols)))
+
+
+def df_a_texto(df: pd.DataFrame, columnas: list = None, fmt_fecha: str = FMT_FECHA) -> pd.DataFrame:
+    """
+    DataFrame -> DataFrame de strings ("" para vacíos), para comparar contra lo que devuelve Sheets.
+    """
+    if columnas is not None:
+        df = df.reindex(columns=columnas, fill_value="")
+    out = pd.DataFrame(
+        {j: serializar_columna(df.iloc[:, j], True, fmt_fecha) for j in range(df.shape[1])},
+        index=df.index,
+    )
+    out.columns = df.columns
+    return out
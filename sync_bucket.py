@@ -4,6 +4,13 @@ import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 
+# Capa de fechas compartida con sync_bucket_updates_only.py
+from fechas_sync import parse_date_series as _parse_date_series
+# Serializador único DataFrame -> payload de Sheets
+from sheets_payload import df_a_filas
+# Snapshot local del Funnel publicado por el timeline
+from funnel_snapshot import cargar_snapshot_funnel, ordenar_vigentes
+
 # =========================================================
 # CONFIG
 # =========================================================
@@ -48,15 +55,6 @@ MONTHLY_CLEAR_COLS = [
 def _norm_col(s):
     return str(s).strip()
 
-def _parse_date_series(x):
-    dt = pd.to_datetime(x, errors="coerce")
-    if dt.isna().mean() > 0.90:
-        dt = pd.to_datetime(
-            x.astype(str).str.replace("T", " ", regex=False),
-            errors="coerce"
-        )
-    return dt
-
 def get_gspread_client():
     mi_json = None
 
@@ -105,7 +103,7 @@ def get_or_create_worksheet(gc, sheet_id, tab_name):
     return ws
 
 def df_to_rows(df, header):
-    return df.reindex(columns=header, fill_value="").astype(str).values.tolist()
+    return df_a_filas(df, header, texto=True)
 
 def clear_monthly_fields_if_not_current_month(df_bucket, tz=TZ):
     if df_bucket.empty:
@@ -138,7 +136,12 @@ def main():
     gc = get_gspread_client()
 
     # ------------------ Leer Funnel ------------------
-    df_funnel, _, _ = read_worksheet_as_df(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME)
+    # Snapshot del timeline si la hoja no cambió desde que lo escribió; si no, Sheets
+    snapshot = cargar_snapshot_funnel(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME, col_fecha=COL_INSERTED_AT)
+    if snapshot is not None:
+        df_funnel = snapshot["df"]
+    else:
+        df_funnel, _, _ = read_worksheet_as_df(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME)
 
     if df_funnel.empty:
         print("Funnel vacío")
@@ -154,10 +157,13 @@ def main():
     df_funnel[COL_NEGOCIADOR] = df_funnel[COL_NEGOCIADOR].astype(str).str.strip()
 
     df_funnel[COL_BUCKET] = pd.to_numeric(df_funnel[COL_BUCKET], errors="coerce")
-    df_funnel = df_funnel[df_funnel[COL_BUCKET].notna()].copy()
-    df_funnel[COL_BUCKET] = df_funnel[COL_BUCKET].astype(int)
-
+    # Fechas sobre la columna completa, antes de filtrar: es lo mismo que parsea el snapshot
+    # (la inferencia del formato depende de los valores), así los dos caminos ordenan igual
     df_funnel["_inserted_dt"] = _parse_date_series(df_funnel[COL_INSERTED_AT])
+    # Máscara por posición (el "orden" del snapshot son posiciones, no etiquetas del índice)
+    con_bucket = df_funnel[COL_BUCKET].notna().to_numpy()
+    df_funnel = df_funnel[con_bucket].copy()
+    df_funnel[COL_BUCKET] = df_funnel[COL_BUCKET].astype(int)
 
     # =========================================================
     # ACTIVIDAD RECIENTE: HOY, AYER O ANTEAYER
@@ -214,9 +220,12 @@ def main():
     # =========================================================
     removed_refs = set()
 
+    # Orden por fecha (estable): ya viene en el snapshot, solo se filtra a las filas vigentes
+    orden = snapshot["orden"] if snapshot is not None else None
+    df_funnel_sorted = ordenar_vigentes(df_funnel, "_inserted_dt", con_bucket, orden)
+
     df_funnel_latest_bucket = (
-        df_funnel
-        .sort_values("_inserted_dt")
+        df_funnel_sorted
         .groupby(COL_REF, as_index=False)
         .tail(1)[[COL_REF, COL_BUCKET]]
         .copy()
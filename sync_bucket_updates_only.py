@@ -17,6 +17,19 @@
 # FIX ZONA HORARIA (SIN DOBLE CONVERSIÓN):
 # - NO convertimos df_latest["Fecha Actualizacion"] antes del merge.
 # - Convertimos SOLO UNA VEZ al momento de actualizar Bucket.
+#
+# FECHAS (fechas_sync.py):
+# - to_bogota_str y _parse_date_series vienen de fechas_sync: la columna de Bucket
+#   pasa 3 veces por to_bogota_str, pero cada string se parsea/formatea una sola vez.
+#
+# ESCRITURA (sheets_payload.py):
+# - update_only_columns serializa cada columna con el serializador compartido
+#   (vacíos/NaN -> "", 3.0 -> "3") en vez de astype(str).
+#
+# FUNNEL (funnel_snapshot.py):
+# - Si el timeline dejó un snapshot local y la hoja no cambió desde entonces (misma
+#   versión), se usa en vez de leer todo el Funnel, con la última fila por Id deuda
+#   ya calculada (sin sort + groupby). Si no, se lee Sheets como siempre.
 # ---------------------------------------------------------
 
 import os
@@ -26,6 +39,13 @@ import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
 
+# ✅ Capa de fechas compartida: formato detectado una vez por columna, únicos y cache por corrida
+from fechas_sync import parse_date_series as _parse_date_series, to_bogota_str
+# ✅ Serializador único DataFrame -> payload de Sheets
+from sheets_payload import serializar_columna
+# ✅ Snapshot local del Funnel publicado por el timeline
+from funnel_snapshot import cargar_snapshot_funnel
+
 FUNNEL_SHEET_ID = "1Bm1wjsfXdNDFrFTStQJHkERC08Eo21BwjZnu-WncibY"
 FUNNEL_TAB_NAME = "Funnel"
 
@@ -123,12 +143,6 @@ UPDATE_COLS_FUNNEL = [
 def _norm_col(s):
     return str(s).strip()
 
-def _parse_date_series(x: pd.Series) -> pd.Series:
-    dt = pd.to_datetime(x, errors="coerce")
-    if dt.isna().mean() > 0.90:
-        dt = pd.to_datetime(x.astype(str).str.replace("T", " ", regex=False), errors="coerce")
-    return dt
-
 def _is_blank_series(s: pd.Series) -> pd.Series:
     s2 = s.astype(str).str.strip()
     return s.isna() | s2.eq("") | s2.str.lower().isin(["nan", "none", "nat"])
@@ -186,34 +200,6 @@ def _to_num_strict(v: pd.Series) -> pd.Series:
 
     return out
 
-def to_bogota_str(x: pd.Series, tz_local: str = TZ, assume_naive_is_utc: bool = True) -> pd.Series:
-    s = x.astype(str).str.strip()
-    s = s.str.replace("T", " ", regex=False)
-
-    blank = _is_blank_series(s)
-    out = pd.Series([""] * len(s), index=s.index, dtype="object")
-    if blank.all():
-        return out
-
-    is_utc_hint = s.str.contains(r"(?:Z$|\+00:00|\+0000|UTC)", case=False, regex=True)
-
-    if is_utc_hint.any():
-        dt_utc = pd.to_datetime(s[is_utc_hint], errors="coerce", utc=True)
-        dt_local = dt_utc.dt.tz_convert(tz_local)
-        out.loc[is_utc_hint] = dt_local.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_local.notna(), "")
-
-    if (~is_utc_hint).any():
-        dt_naive = pd.to_datetime(s[~is_utc_hint], errors="coerce")
-        if assume_naive_is_utc:
-            dt_utc2 = dt_naive.dt.tz_localize("UTC", nonexistent="NaT", ambiguous="NaT")
-            dt_local2 = dt_utc2.dt.tz_convert(tz_local)
-            out.loc[~is_utc_hint] = dt_local2.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_local2.notna(), "")
-        else:
-            out.loc[~is_utc_hint] = dt_naive.dt.strftime("%Y-%m-%d %H:%M:%S").where(dt_naive.notna(), "")
-
-    out = out.where(~blank, "")
-    return out
-
 def clear_monthly_fields_if_not_current_month(df_bucket: pd.DataFrame, tz: str = TZ) -> pd.DataFrame:
     if df_bucket.empty or "Fecha Actualizacion" not in df_bucket.columns:
         return df_bucket
@@ -288,15 +274,19 @@ def update_only_columns(ws, df_final: pd.DataFrame, header: list, cols_to_write:
 
         ws.update(
             range_name=rng,
-            values=[[v] for v in df_final[col_name].astype(str).tolist()],
+            values=[[v] for v in serializar_columna(df_final[col_name], texto=True)],
             value_input_option="USER_ENTERED"
         )
 
 def main():
     gc = get_gspread_client()
 
-    # -------- Funnel --------
-    df_funnel, _, _ = read_worksheet_as_df(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME)
+    # -------- Funnel (snapshot del timeline si la hoja no cambió; si no, Sheets) --------
+    snapshot = cargar_snapshot_funnel(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME, col_fecha=COL_INSERTED_AT, col_id=COL_REF)
+    if snapshot is not None:
+        df_funnel = snapshot["df"]
+    else:
+        df_funnel, _, _ = read_worksheet_as_df(gc, FUNNEL_SHEET_ID, FUNNEL_TAB_NAME)
     if df_funnel.empty:
         print("Funnel vacío.")
         return
@@ -306,7 +296,8 @@ def main():
             raise RuntimeError(f"Falta columna '{c}' en Funnel")
 
     df_funnel[COL_REF] = df_funnel[COL_REF].astype(str).str.strip()
-    df_funnel["_inserted_dt"] = _parse_date_series(df_funnel[COL_INSERTED_AT])
+    if snapshot is None:
+        df_funnel["_inserted_dt"] = _parse_date_series(df_funnel[COL_INSERTED_AT])
 
     has_ce = COL_CE in df_funnel.columns
     has_ahorro = COL_AHORRO_FUNNEL in df_funnel.columns
@@ -326,12 +317,16 @@ def main():
 
     cols_needed = [c for c in cols_needed if c in df_funnel.columns]
 
-    df_latest = (
-        df_funnel.sort_values("_inserted_dt")
-                 .groupby(COL_REF, as_index=False)
-                 .tail(1)[cols_needed]
-                 .copy()
-    )
+    if snapshot is not None:
+        # Última fila por Id deuda ya calculada por el timeline (mismo resultado que sort estable + tail)
+        df_latest = df_funnel.iloc[snapshot["ultimas"]][cols_needed].copy()
+    else:
+        df_latest = (
+            df_funnel.sort_values("_inserted_dt", kind="stable")
+                     .groupby(COL_REF, as_index=False)
+                     .tail(1)[cols_needed]
+                     .copy()
+        )
 
     df_latest.rename(columns=FUNNEL_TO_BUCKET_RENAME, inplace=True)
 
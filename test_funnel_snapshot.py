@@ -0,0 +1,95 @@
+# test_funnel_snapshot.py
+# ---------------------------------------------------------
+# Pruebas del snapshot del Funnel (funnel_snapshot.py)
+# - Con snapshot ("orden" / "ultimas") y leyendo Sheets, sync_bucket.py y
+#   sync_bucket_updates_only.py deben quedarse con las mismas filas, también
+#   con fechas en formatos mezclados (la inferencia depende de los valores)
+#
+# Uso: python -m pytest -q test_funnel_snapshot.py
+# ---------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from fechas_sync import limpiar_cache_fechas, parse_date_series
+from funnel_snapshot import calcular_orden_ultimas, ordenar_vigentes
+
+COL_ID = "Id deuda"
+COL_REF = "Referencia"
+COL_BUCKET = "Bucket"
+COL_FECHA = "inserted_at_ultima"
+
+
+def _funnel_mixto() -> pd.DataFrame:
+    # Como lo devuelve get_all_values: todo texto. La primera fila (ISO) no tiene Bucket,
+    # así que las filas vigentes empiezan con fechas d/m/Y y m/d/Y ambiguas.
+    rng = np.random.default_rng(7)
+    n = 400
+    base = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 300, n), unit="D")
+    fechas = [
+        b.strftime("%Y-%m-%d %H:%M:%S") if k % 3 == 0 else b.strftime("%d/%m/%Y %H:%M:%S")
+        for k, b in enumerate(base)
+    ]
+    fechas[5] = ""
+    bucket = rng.integers(1, 6, n).astype(str)
+    bucket[::9] = ""
+    return pd.DataFrame({
+        COL_ID: rng.integers(1000, 1080, n).astype(str),
+        COL_REF: rng.integers(1, 60, n).astype(str),
+        COL_BUCKET: bucket,
+        COL_FECHA: fechas,
+    })
+
+
+def _ultimo_bucket_sync_bucket(df_funnel: pd.DataFrame, snapshot) -> pd.DataFrame:
+    # Mismos pasos que sync_bucket.py: fechas sobre la columna completa, filtro por Bucket y orden
+    df_funnel = df_funnel.copy()
+    df_funnel[COL_BUCKET] = pd.to_numeric(df_funnel[COL_BUCKET], errors="coerce")
+    df_funnel["_inserted_dt"] = parse_date_series(df_funnel[COL_FECHA])
+    con_bucket = df_funnel[COL_BUCKET].notna().to_numpy()
+    df_funnel = df_funnel[con_bucket].copy()
+    orden = snapshot["orden"] if snapshot is not None else None
+    ordenado = ordenar_vigentes(df_funnel, "_inserted_dt", con_bucket, orden)
+    return ordenado.groupby(COL_REF, as_index=False).tail(1)[[COL_REF, COL_BUCKET]].reset_index(drop=True)
+
+
+def test_fixture_mezcla_formatos():
+    # Sin esto la prueba no demuestra nada: parsear solo las filas filtradas da otras fechas
+    limpiar_cache_fechas()
+    df = _funnel_mixto()
+    vigentes = pd.to_numeric(df[COL_BUCKET], errors="coerce").notna()
+    completa = parse_date_series(df[COL_FECHA])[vigentes]
+    filtrada = parse_date_series(df.loc[vigentes, COL_FECHA])
+    assert not completa.equals(filtrada)
+
+
+def test_sync_bucket_snapshot_igual_a_sheets():
+    limpiar_cache_fechas()
+    df = _funnel_mixto()
+    orden, ultimas = calcular_orden_ultimas(df, COL_FECHA, COL_ID)
+    con_snapshot = _ultimo_bucket_sync_bucket(df, {"orden": orden, "ultimas": ultimas})
+    limpiar_cache_fechas()
+    desde_sheets = _ultimo_bucket_sync_bucket(df, None)
+    pd.testing.assert_frame_equal(con_snapshot, desde_sheets)
+
+
+def test_sync_bucket_indice_no_posicional():
+    limpiar_cache_fechas()
+    df = _funnel_mixto()
+    orden, ultimas = calcular_orden_ultimas(df, COL_FECHA, COL_ID)
+    esperado = _ultimo_bucket_sync_bucket(df, None)
+    df.index = df.index * 10 + 3
+    obtenido = _ultimo_bucket_sync_bucket(df, {"orden": orden, "ultimas": ultimas})
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_updates_only_ultimas_igual_a_sheets():
+    limpiar_cache_fechas()
+    df = _funnel_mixto()
+    _, ultimas = calcular_orden_ultimas(df, COL_FECHA, COL_ID)
+    # Camino de Sheets de sync_bucket_updates_only.py
+    fb = df.copy()
+    fb[COL_ID] = fb[COL_ID].astype(str).str.strip()
+    fb["_inserted_dt"] = parse_date_series(fb[COL_FECHA])
+    esperado = fb.sort_values("_inserted_dt", kind="stable").groupby(COL_ID, as_index=False).tail(1)
+    pd.testing.assert_frame_equal(df.iloc[ultimas], esperado.drop(columns="_inserted_dt"))
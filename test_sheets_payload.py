@@ -0,0 +1,76 @@
+# test_sheets_payload.py
+# ---------------------------------------------------------
+# Pruebas del serializador único (sheets_payload.py)
+# - Escapado del "'" inicial en los payloads de escritura (USER_ENTERED)
+# - La copia embebida en los notebooks (respaldo Colab) es idéntica al módulo
+#
+# Uso: python -m pytest -q test_sheets_payload.py
+# ---------------------------------------------------------
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sheets_payload import df_a_filas, df_a_texto, escapar_apostrofes, serializar_columna
+
+RAIZ = Path(__file__).resolve().parent
+NOTEBOOKS = ["Bucket_Renovado.ipynb", "EJECUCIÓN_DIARIA_TIMELINE_CARTERA.ipynb"]
+
+
+def _df_prueba() -> pd.DataFrame:
+    return pd.DataFrame({
+        "texto": ["'0012", "normal", "=SUMA(A1)", None, "'"],
+        "mixta": ["'abc", 3.0, "", np.nan, "x'"],
+        "categoria": pd.Categorical(["'A", "B", None, "'A", "B"]),
+        "numero": [1.5, 2.0, np.nan, np.inf, -3.0],
+        "fecha": pd.to_datetime(["2024-01-02 03:04:05", None, "2024-02-03 00:00:00", "2024-03-04 00:00:00", "2024-04-05 00:00:00"]),
+    })
+
+
+def test_escapar_apostrofes_solo_textos_que_empiezan_con_apostrofe():
+    v = np.array(["'a", "a'", "", "''b", 3, None], dtype=object)
+    assert escapar_apostrofes(v).tolist() == ["''a", "a'", "", "'''b", 3, None]
+    # Sin nada que escapar se devuelve el mismo arreglo
+    sin = np.array(["a", 1], dtype=object)
+    assert escapar_apostrofes(sin) is sin
+
+
+def test_df_a_filas_escapa_para_escritura():
+    filas = df_a_filas(_df_prueba(), escapar=True)
+    assert filas[0] == ["''0012", "''abc", "''A", 1.5, "2024-01-02 03:04:05"]
+    assert filas[1] == ["normal", 3, "B", 2, ""]
+    # Fórmulas y el resto de valores no se tocan (Sheets las interpreta como con set_with_dataframe)
+    assert filas[2] == ["=SUMA(A1)", "", "", "", "2024-02-03 00:00:00"]
+    assert filas[3] == ["", "", "''A", "", "2024-03-04 00:00:00"]
+    assert filas[4] == ["''", "x'", "B", -3, "2024-04-05 00:00:00"]
+
+
+def test_escapado_tambien_en_modo_texto():
+    v = serializar_columna(pd.Series(["'1", 2, None], dtype=object), texto=True, escapar=True)
+    assert v.tolist() == ["''1", "2", ""]
+
+
+def test_sin_escapar_por_defecto_y_en_comparacion():
+    # Lo que se compara contra get_all_values no se escapa (Sheets devuelve el texto sin el "'" extra)
+    df = _df_prueba()
+    assert df_a_filas(df)[0][:3] == ["'0012", "'abc", "'A"]
+    assert df_a_texto(df).iloc[0, :3].tolist() == ["'0012", "'abc", "'A"]
+
+
+def _copia_embebida(notebook: str) -> str:
+    nb = json.loads((RAIZ / notebook).read_text(encoding="utf-8"))
+    inicio = "_SHEETS_PAYLOAD_COLAB = r'''"
+    for cell in nb["cells"]:
+        src = "".join(cell["source"])
+        if inicio in src:
+            resto = src[src.index(inicio) + len(inicio):]
+            return resto[:resto.index("'''")]
+    raise AssertionError(f"{notebook}: no se encontró la copia embebida de sheets_payload.py")
+
+
+def test_copias_de_los_notebooks_iguales_al_modulo():
+    modulo = (RAIZ / "sheets_payload.py").read_text(encoding="utf-8")
+    for notebook in NOTEBOOKS:
+        assert _copia_embebida(notebook) == modulo, f"{notebook}: copia desactualizada de sheets_payload.py"